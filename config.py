@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from pydantic import field_validator
+from pydantic import SecretStr, field_validator
 
 class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
@@ -20,6 +20,7 @@ class Settings(BaseSettings):
     # Supabase Configuration
     SUPABASE_URL: str = ""
     SUPABASE_ANON_KEY: str = ""
+    SUPABASE_JWT_SECRET: SecretStr = SecretStr("")  # Enables local HS256 access token verification
 
     class Config:
         env_file = ".env"
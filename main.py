@@ -2,8 +2,14 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
+from contextlib import asynccontextmanager, suppress
 from routes.inference_router import router as inference_router
 from routes.auth_router import router as auth_router
+from services.auth_service import get_auth_service, SUPABASE_MAX_CONCURRENCY
+from services.redis import get_redis_service
+from services.openai_service import get_openai_service
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
 import os
 
@@ -16,10 +22,44 @@ logging.basicConfig(
 # Create logger for this module
 logger = logging.getLogger(__name__)
 
+# Blocking client calls (Supabase, Redis) run in the default executor; size it so
+# the Supabase semaphore, not the pool, is the limit, with room for Redis calls
+BLOCKING_IO_WORKERS = SUPABASE_MAX_CONCURRENCY + 16
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="blocking-io")
+    )
+    # Connect to Redis (ping with a socket timeout) off the loop before services need it
+    await asyncio.to_thread(get_redis_service)
+    # Probe OpenAI connectivity in the background; startup doesn't wait on it
+    openai_service = get_openai_service()
+    if openai_service is not None:
+        openai_service.start_health_probe()
+    # Keep auth health status fresh in the background instead of checking at import
+    auth_service = get_auth_service()
+    await auth_service.ensure_profiles_table_exists()
+    await asyncio.to_thread(auth_service.load_email_filter)
+    background_tasks = [
+        asyncio.create_task(auth_service.run_health_checks()),
+        asyncio.create_task(auth_service.run_last_login_flusher()),
+    ]
+    yield
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    # Write any last_login timestamps still buffered
+    await auth_service.flush_last_logins()
+    # Release pooled connections on shutdown
+    auth_service.close()
+
 app = FastAPI(
     title="Reprompt Chatbot API",
     description="A FastAPI application for AI-powered prompt optimization with authentication",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
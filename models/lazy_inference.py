@@ -1,12 +1,12 @@
+import asyncio
 import os
 from dotenv import load_dotenv
-from config import settings
-from services.openai_service import openai_client
+from services.openai_service import get_openai_service
 
 # Load environment variables from .env file
 # load_dotenv()
 
-def optimize_prompt(prompt: str) -> str:
+async def optimize_prompt(prompt: str) -> str:
     """
     Optimize a user prompt using simple and efficient AI techniques.
     This lazy version uses straightforward optimization strategies.
@@ -17,12 +17,15 @@ def optimize_prompt(prompt: str) -> str:
     Returns:
         str: The optimized prompt
     """
-    if openai_client is None:
+    # Resolved per call so importing this module doesn't build the OpenAI service
+    openai_service = get_openai_service()
+    if openai_service is None:
         raise Exception("OpenAI client is not configured. Please set your OPENAI_API_KEY environment variable.")
     
     try:
-        completion = openai_client.chat.completions.create(
-            model=settings.LAZY_MODEL,
+        # Through the service so the request and any throttling are tracked;
+        # the lazy mode supplies the model, max tokens and temperature from settings
+        completion = await openai_service.chat_completion(
             messages=[
                 {
                     "role": "user",
@@ -38,10 +41,9 @@ Make it:
 Just give me the improved prompt:""",
                 },
             ],
-            max_tokens=settings.LAZY_MAX_TOKENS,
-            temperature=settings.LAZY_TEMPERATURE,
+            mode="lazy",
         )
-        return completion.choices[0].message.content
+        return completion["content"]
     except Exception as e:
         raise Exception(f"Error optimizing prompt: {str(e)}")
 
@@ -51,7 +53,7 @@ if __name__ == "__main__":
     prompt = input("Enter your prompt: ")
     
     try:
-        optimized_prompt = optimize_prompt(prompt)
+        optimized_prompt = asyncio.run(optimize_prompt(prompt))
         print("Optimized prompt:", optimized_prompt)
     except Exception as e:
         print(f"Error: {e}")
\ No newline at end of file
@@ -1,9 +1,9 @@
+import asyncio
 import os
 from dotenv import load_dotenv
-from config import settings
-from services.openai_service import openai_client
+from services.openai_service import get_openai_service
 
-def optimize_prompt(prompt: str) -> str:
+async def optimize_prompt(prompt: str) -> str:
     """
     Optimize a user prompt using advanced AI techniques for maximum effectiveness.
     This pro version uses more sophisticated prompting strategies.
@@ -14,12 +14,15 @@ def optimize_prompt(prompt: str) -> str:
     Returns:
         str: The optimized prompt
     """
-    if openai_client is None:
+    # Resolved per call so importing this module doesn't build the OpenAI service
+    openai_service = get_openai_service()
+    if openai_service is None:
         raise Exception("OpenAI client is not configured. Please set your OPENAI_API_KEY environment variable.")
     
     try:
-        completion = openai_client.chat.completions.create(
-            model=settings.PRO_MODEL,
+        # Through the service so the request and any throttling are tracked;
+        # the pro mode supplies the model, max tokens and temperature from settings
+        completion = await openai_service.chat_completion(
             messages=[
                 {
                     "role": "system",
@@ -53,10 +56,9 @@ REQUIREMENTS:
 Please provide the optimized version:""",
                 },
             ],
-            max_tokens=settings.PRO_MAX_TOKENS,
-            temperature=settings.PRO_TEMPERATURE,
+            mode="pro",
         )
-        return completion.choices[0].message.content
+        return completion["content"]
     except Exception as e:
         raise Exception(f"Error optimizing prompt: {str(e)}")
 
@@ -66,7 +68,7 @@ if __name__ == "__main__":
     prompt = input("Enter your prompt: ")
     
     try:
-        optimized_prompt = optimize_prompt(prompt)
+        optimized_prompt = asyncio.run(optimize_prompt(prompt))
         print("Optimized prompt:", optimized_prompt)
     except Exception as e:
         print(f"Error: {e}")
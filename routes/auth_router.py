@@ -27,7 +27,7 @@ Version: 1.0.0
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from loguru import logger
-from datetime import datetime
+from datetime import datetime, timezone
 from schemas.auth_schema import (
     UserRegisterRequest, UserRegisterResponse,
     UserLoginRequest, UserLoginResponse,
@@ -35,7 +35,7 @@ from schemas.auth_schema import (
     LogoutRequest, LogoutResponse,
     UserProfile, AuthError
 )
-from services.auth_service import auth_service
+from services.auth_service import AuthService, get_auth_service
 
 # Initialize router
 router = APIRouter(prefix="/auth", tags=["authentication"])
@@ -43,8 +43,17 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 # Security scheme for Bearer tokens
 security = HTTPBearer(auto_error=False)
 
+# Async so FastAPI resolves it on the event loop; a plain def dependency
+# would cost a threadpool hop on every request just to return the singleton
+async def provide_auth_service() -> AuthService:
+    """Return the shared AuthService for injection into routes"""
+    return get_auth_service()
+
 # Dependency to get current user from token
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserProfile:
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    auth_service: AuthService = Depends(provide_auth_service)
+) -> UserProfile:
     """
     Get current authenticated user from JWT token.
     
@@ -53,6 +62,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     
     Args:
         credentials (HTTPAuthorizationCredentials): Bearer token from Authorization header
+        auth_service (AuthService): Authentication service (injected by dependency)
         
     Returns:
         UserProfile: The authenticated user's profile information
@@ -77,7 +87,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             )
         return user
     except Exception as e:
-        logger.error(f"Failed to get current user: {e}")
+        logger.error("Failed to get current user: {}", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication token",
@@ -85,7 +95,10 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         )
 
 @router.post("/signup", response_model=UserRegisterResponse, status_code=status.HTTP_201_CREATED)
-async def register_user(user_data: UserRegisterRequest):
+async def register_user(
+    user_data: UserRegisterRequest,
+    auth_service: AuthService = Depends(provide_auth_service)
+):
     """
     Register a new user with email and password.
     
@@ -97,6 +110,7 @@ async def register_user(user_data: UserRegisterRequest):
             - email (str): User's email address (must be valid email format)
             - password (str): User's password (minimum 6 characters)
             - confirm_password (str): Password confirmation (must match password)
+        auth_service (AuthService): Authentication service (injected by dependency)
     
     Returns:
         UserRegisterResponse: Registration response containing:
@@ -109,18 +123,18 @@ async def register_user(user_data: UserRegisterRequest):
         HTTPException: 500 if internal server error occurs
     """
     try:
-        logger.info(f"User registration attempt for email: {user_data.email}")
-        logger.info(f"Request data: {user_data}")
+        logger.info("User registration attempt for email: {}", user_data.email)
+        logger.info("Request data: {}", user_data)
         
         # Test if auth service is accessible
         logger.info("Calling auth service...")
         result = await auth_service.register_user(user_data)
-        logger.info(f"User registered successfully: {result.id}")
+        logger.info("User registered successfully: {}", result.id)
         return result
         
     except AuthError as e:
-        logger.warning(f"Registration failed for {user_data.email}: {e.message}")
-        logger.warning(f"AuthError details: error={e.error}, message={e.message}")
+        logger.warning("Registration failed for {}: {}", user_data.email, e.message)
+        logger.warning("AuthError details: error={}, message={}", e.error, e.message)
         if e.error == "user_exists":
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -131,18 +145,21 @@ async def register_user(user_data: UserRegisterRequest):
             detail=e.message
         )
     except Exception as e:
-        logger.error(f"Unexpected error during registration: {e}")
-        logger.error(f"Error type: {type(e).__name__}")
-        logger.error(f"Error details: {str(e)}")
+        logger.error("Unexpected error during registration: {}", e)
+        logger.error("Error type: {}", type(e).__name__)
+        logger.error("Error details: {}", str(e))
         import traceback
-        logger.error(f"Full traceback: {traceback.format_exc()}")
+        logger.error("Full traceback: {}", traceback.format_exc())
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during registration"
         )
 
 @router.post("/login", response_model=UserLoginResponse)
-async def login_user(login_data: UserLoginRequest):
+async def login_user(
+    login_data: UserLoginRequest,
+    auth_service: AuthService = Depends(provide_auth_service)
+):
     """
     Authenticate user with email and password.
     
@@ -153,6 +170,7 @@ async def login_user(login_data: UserLoginRequest):
         login_data (UserLoginRequest): Login credentials containing:
             - email (str): User's email address
             - password (str): User's password
+        auth_service (AuthService): Authentication service (injected by dependency)
     
     Returns:
         UserLoginResponse: Login response containing:
@@ -166,12 +184,12 @@ async def login_user(login_data: UserLoginRequest):
         HTTPException: 500 if internal server error occurs
     """
     try:
-        logger.info(f"Login attempt for email: {login_data.email}")
+        logger.info("Login attempt for email: {}", login_data.email)
         result = await auth_service.login_user(login_data)
-        logger.info(f"User logged in successfully: {result.user.id}")
+        logger.info("User logged in successfully: {}", result.user.id)
         return result
     except AuthError as e:
-        logger.warning(f"Login failed for {login_data.email}: {e.message}")
+        logger.warning("Login failed for {}: {}", login_data.email, e.message)
         if e.error == "invalid_credentials":
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -182,14 +200,18 @@ async def login_user(login_data: UserLoginRequest):
             detail=e.message
         )
     except Exception as e:
-        logger.error(f"Unexpected error during login: {e}")
+        logger.error("Unexpected error during login: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during login"
         )
 
 @router.post("/logout", response_model=LogoutResponse)
-async def logout_user(logout_data: LogoutRequest):
+async def logout_user(
+    logout_data: LogoutRequest,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    auth_service: AuthService = Depends(provide_auth_service)
+):
     """
     Logout user and invalidate refresh token.
     
@@ -199,6 +221,9 @@ async def logout_user(logout_data: LogoutRequest):
     Args:
         logout_data (LogoutRequest): Logout request containing:
             - refresh_token (str): The refresh token to invalidate
+        credentials (HTTPAuthorizationCredentials): Optional bearer access token,
+            dropped from the token validation cache when provided
+        auth_service (AuthService): Authentication service (injected by dependency)
     
     Returns:
         LogoutResponse: Logout response containing:
@@ -212,18 +237,22 @@ async def logout_user(logout_data: LogoutRequest):
         will return a success response as the client will discard tokens anyway.
     """
     try:
-        logger.info(f"User logout attempt with token: {logout_data.refresh_token}...")
-        result = await auth_service.logout_user(logout_data.refresh_token)
+        logger.info("User logout attempt with token: {}...", logout_data.refresh_token)
+        access_token = credentials.credentials if credentials else None
+        result = await auth_service.logout_user(logout_data.refresh_token, access_token)
         logger.info("User logged out successfully")
         return result
     except Exception as e:
-        logger.error(f"Error during logout: {e}")
+        logger.error("Error during logout: {}", e)
         # Even if logout fails, we should still return success
         # as the client will discard the tokens anyway
         return LogoutResponse(message="User logged out successfully")
 
 @router.post("/refresh", response_model=TokenRefreshResponse)
-async def refresh_token(refresh_data: TokenRefreshRequest):
+async def refresh_token(
+    refresh_data: TokenRefreshRequest,
+    auth_service: AuthService = Depends(provide_auth_service)
+):
     """
     Refresh access token using refresh token.
     
@@ -233,6 +262,7 @@ async def refresh_token(refresh_data: TokenRefreshRequest):
     Args:
         refresh_data (TokenRefreshRequest): Refresh request containing:
             - refresh_token (str): Valid refresh token for token renewal
+        auth_service (AuthService): Authentication service (injected by dependency)
     
     Returns:
         TokenRefreshResponse: Token refresh response containing:
@@ -249,13 +279,13 @@ async def refresh_token(refresh_data: TokenRefreshRequest):
         logger.info("Token refreshed successfully")
         return result
     except AuthError as e:
-        logger.warning(f"Token refresh failed: {e.message}")
+        logger.warning("Token refresh failed: {}", e.message)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=e.message
         )
     except Exception as e:
-        logger.error(f"Unexpected error during token refresh: {e}")
+        logger.error("Unexpected error during token refresh: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during token refresh"
@@ -283,10 +313,10 @@ async def get_user_profile(current_user: UserProfile = Depends(get_current_user)
         HTTPException: 500 if internal server error occurs
     """
     try:
-        logger.info(f"Profile request for user: {current_user.id}")
+        logger.info("Profile request for user: {}", current_user.id)
         return current_user
     except Exception as e:
-        logger.error(f"Error getting user profile: {e}")
+        logger.error("Error getting user profile: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while fetching profile"
@@ -314,14 +344,14 @@ async def validate_token(current_user: UserProfile = Depends(get_current_user)):
         HTTPException: 500 if internal server error occurs
     """
     try:
-        logger.info(f"Token validation request for user: {current_user.id}")
+        logger.info("Token validation request for user: {}", current_user.id)
         return {
             "valid": True,
             "user_id": current_user.id,
             "email": current_user.email
         }
     except Exception as e:
-        logger.error(f"Error validating token: {e}")
+        logger.error("Error validating token: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while validating token"
@@ -351,17 +381,17 @@ async def auth_health_check():
         return {
             "status": "healthy",
             "service": "authentication",
-            "timestamp":datetime.utcnow().isoformat()  # You can make this dynamic
+            "timestamp": datetime.now(timezone.utc).isoformat()  # You can make this dynamic
         }
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: {}", e)
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Authentication service is not healthy"
         )
 
 @router.post("/create-missing-profiles", response_model=dict)
-async def create_missing_profiles():
+async def create_missing_profiles(auth_service: AuthService = Depends(provide_auth_service)):
     """
     Create profiles for users who exist in auth.users but not in profiles table.
     
@@ -369,6 +399,9 @@ async def create_missing_profiles():
     auth.users table and the custom profiles table. It creates profile records
     for users who have authentication records but are missing profile data.
     
+    Args:
+        auth_service (AuthService): Authentication service (injected by dependency)
+    
     Returns:
         dict: Operation result containing:
             - message (str): Description of the operation result
@@ -385,10 +418,10 @@ async def create_missing_profiles():
     try:
         logger.info("Creating missing profiles for existing auth users")
         result = await auth_service.create_missing_profiles()
-        logger.info(f"Profile creation completed: {result}")
+        logger.info("Profile creation completed: {}", result)
         return result
     except Exception as e:
-        logger.error(f"Failed to create missing profiles: {e}")
+        logger.error("Failed to create missing profiles: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create missing profiles"
@@ -1,17 +1,25 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from schemas.inference_schema import InferenceRequest, InferenceResponse, InferenceType
 from models.lazy_inference import optimize_prompt as lazy_optimize_prompt
 from models.pro_inference import optimize_prompt as pro_optimize_prompt
-from services.redis import RedisService
+from services.redis import get_redis_service, OPTIMIZATION_CACHE_TTL
 from config import settings
+from utils.helpers import TTLCache
+import asyncio
 import logging
 import hashlib
+import time
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Initialize Redis service
-redis_service = RedisService()
+# In-process LRU of serialized cache-hit responses, so repeated hits skip
+# Redis, model construction and JSON serialization entirely. Each worker has
+# its own copy and /cache/clear only empties the local one, so the TTL is kept
+# short to bound how long other workers keep serving cleared results.
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+RESPONSE_CACHE_TTL = 60
+_response_cache = TTLCache(maxsize=RESPONSE_CACHE_MAX_ENTRIES, ttl=RESPONSE_CACHE_TTL)
 
 @router.post("/optimize-prompt", response_model=InferenceResponse)
 async def optimize_prompt_endpoint(request: InferenceRequest):
@@ -49,36 +57,57 @@ async def optimize_prompt_endpoint(request: InferenceRequest):
 
     try:
         logger.info(f"Received {request.inference_type} prompt optimization request: {request.prompt[:50]}...")
+        redis_service = get_redis_service()
         
-        # Check cache first
-        cached_result = redis_service.get_cached_optimization(request.prompt, request.inference_type.value)
+        # Check the in-process response cache, then Redis
+        cache_key = (request.prompt, request.inference_type.value)
+        cached_body = _response_cache.get(cache_key)
+        if cached_body is not None:
+            logger.info("Returning cached response")
+            return Response(content=cached_body, media_type="application/json")
+
+        # Redis client is synchronous; keep its round trips off the event loop
+        cached_result = await asyncio.to_thread(
+            redis_service.get_cached_optimization, request.prompt, request.inference_type.value
+        )
         if cached_result:
             logger.info("Returning cached result")
-            return InferenceResponse(
+            response = InferenceResponse(
                 output=cached_result["optimized_prompt"],
                 tokens_used=cached_result["tokens_used"],
                 inference_type=request.inference_type.value,
                 model_used=cached_result["model_used"],
                 cached=True
             )
+            # Never outlive the Redis entry this copy was taken from
+            remaining = cached_result.get("timestamp", 0) + OPTIMIZATION_CACHE_TTL - time.time()
+            if remaining > 0:
+                _response_cache.set(
+                    cache_key,
+                    response.model_dump_json().encode(),
+                    ttl=min(RESPONSE_CACHE_TTL, remaining),
+                )
+            return response
         
         # Route to appropriate inference based on type
         if request.inference_type == InferenceType.LAZY:
-            optimized_prompt = lazy_optimize_prompt(request.prompt)
+            optimized_prompt = await lazy_optimize_prompt(request.prompt)
             model_used = settings.LAZY_MODEL
         elif request.inference_type == InferenceType.PRO:
-            optimized_prompt = pro_optimize_prompt(request.prompt)
+            optimized_prompt = await pro_optimize_prompt(request.prompt)
             model_used = settings.PRO_MODEL
         else:
             raise HTTPException(status_code=400, detail="Invalid inference type")
 
         # Cache the result
-        redis_service.cache_optimized_prompt(
+        await asyncio.to_thread(
+            redis_service.cache_optimized_prompt,
             prompt=request.prompt,
             optimized_prompt=optimized_prompt,
             inference_type=request.inference_type.value,
             model_used=model_used,
-            tokens_used=0  # You can implement token counting if needed
+            tokens_used=0,  # You can implement token counting if needed
+            ttl=OPTIMIZATION_CACHE_TTL
         )
 
         return InferenceResponse(
@@ -196,6 +225,7 @@ async def get_cache_stats():
         - This endpoint is useful for system monitoring and debugging
     """
     try:
+        redis_service = get_redis_service()
         if not redis_service.redis_client:
             return {
                 "status": "unavailable",
@@ -246,8 +276,11 @@ async def clear_cache():
         - This operation is irreversible - all cached optimizations will be lost
         - Use with caution in production environments as it will impact performance
         - Consider using this endpoint for maintenance windows or testing
+        - Only the handling worker's in-process response cache is cleared; other
+          workers may serve their local copies for up to RESPONSE_CACHE_TTL seconds
     """
     try:
+        redis_service = get_redis_service()
         if not redis_service.redis_client:
             raise HTTPException(status_code=503, detail="Redis service not available")
         
@@ -255,6 +288,8 @@ async def clear_cache():
         pattern = "prompt_optimization:*"
         keys = redis_service.redis_client.keys(pattern)
         
+        _response_cache.clear()
+
         if keys:
             deleted = redis_service.redis_client.delete(*keys)
             logger.info(f"Cleared {deleted} cached items")
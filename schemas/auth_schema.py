@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field, model_validator
 from datetime import datetime
+from typing import Optional
 
 
 # User Registration
@@ -34,6 +35,7 @@ class UserLoginResponse(BaseModel):
     access_token: str = Field(..., description="JWT access token")
     refresh_token: str = Field(..., description="JWT refresh token")
     token_type: str = Field(default="bearer", description="Token type")
+    refresh_at: Optional[int] = Field(None, description="Unix time after which the client should refresh the access token")
     user: 'UserProfile' = Field(..., description="User profile information")
 
 # User Profile
@@ -52,6 +54,7 @@ class TokenRefreshResponse(BaseModel):
     """Token refresh response"""
     access_token: str = Field(..., description="New JWT access token")
     token_type: str = Field(default="bearer", description="Token type")
+    refresh_at: Optional[int] = Field(None, description="Unix time after which the client should refresh the access token")
 
 # Logout
 class LogoutRequest(BaseModel):
@@ -1,49 +1,93 @@
 """
 Production-ready OpenAI Service
 
-This service handles OpenAI API operations with rate limiting,
+This service handles OpenAI API operations with request tracking,
 proper error handling, and logging while maintaining original functionality.
+Rate limiting is left to OpenAI: the SDK retries 429s with backoff, honouring
+Retry-After.
 """
 
+import asyncio
+import httpx
 import openai
 import time
-from typing import Dict, Any, List
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+from functools import lru_cache
 from loguru import logger
 from config import settings
 
 # Production configuration constants
-MAX_REQUESTS_PER_MINUTE = 60  # OpenAI's default rate limit
+MAX_REQUESTS_PER_MINUTE = 60  # Nominal budget, reported for observability only
 RATE_LIMIT_WINDOW = 60  # 1 minute
+OPENAI_MAX_RETRIES = 5  # SDK retries (429/5xx/connection) with exponential backoff
+HEALTH_CACHE_TTL = 30  # Seconds a successful health check is reused
+MODELS_CACHE_TTL = 600  # Model catalogs change rarely; 10 minutes
+VALID_MODES = frozenset({"lazy", "pro"})
+MIN_TEMPERATURE, MAX_TEMPERATURE = 0, 2
+MIN_MAX_TOKENS, MAX_MAX_TOKENS = 1, 4000
+HTTP_MAX_CONNECTIONS = 128
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 64
+HTTP_KEEPALIVE_EXPIRY = 60  # seconds
+HTTP_CONNECT_TIMEOUT = 5  # seconds
+HTTP_READ_TIMEOUT = 60  # seconds; completions can take a while
+HTTP_WRITE_TIMEOUT = 10  # seconds
+HTTP_POOL_TIMEOUT = 5  # seconds waiting for a free connection
+
+@lru_cache(maxsize=4)
+def _mode_defaults(mode: str) -> Tuple[str, int, float]:
+    """(model, max_tokens, temperature) configured for a mode"""
+    if mode == "lazy":
+        return settings.LAZY_MODEL, settings.LAZY_MAX_TOKENS, settings.LAZY_TEMPERATURE
+    return settings.PRO_MODEL, settings.PRO_MAX_TOKENS, settings.PRO_TEMPERATURE
 
 class RateLimiter:
-    """Simple rate limiting implementation for OpenAI API calls"""
+    """Request and throttling tracker for OpenAI API calls
+    
+    Doesn't block anything itself; OpenAI enforces the real limits and the SDK
+    backs off on 429s. This only records traffic and throttling for reporting.
+    """
     
     def __init__(self):
-        self.requests: List[float] = []
+        # Monotonic timestamps in arrival order, so expired ones are always at the left
+        self.requests: deque[float] = deque()
+        self.throttled_at: Optional[float] = None  # Last time OpenAI still answered 429 after retries
     
-    def is_rate_limited(self) -> bool:
-        """Check if request is rate limited"""
-        now = time.time()
-        
-        # Clean old requests
-        self.requests = [req_time for req_time in self.requests 
-                        if now - req_time < RATE_LIMIT_WINDOW]
-        
-        if len(self.requests) >= MAX_REQUESTS_PER_MINUTE:
-            return True
-        
+    def _evict(self, now: float):
+        """Drop requests that have left the window"""
+        cutoff = now - RATE_LIMIT_WINDOW
+        while self.requests and self.requests[0] <= cutoff:
+            self.requests.popleft()
+    
+    def is_limited(self) -> bool:
+        """Check if OpenAI has rate limited us within the current window"""
+        now = time.monotonic()
+        self._evict(now)
+        return self.throttled_at is not None and now - self.throttled_at < RATE_LIMIT_WINDOW
+    
+    def record(self):
+        """Count a request against the window, dropping expired ones so the deque stays bounded"""
+        now = time.monotonic()
+        self._evict(now)
         self.requests.append(now)
-        return False
+    
+    def record_throttled(self):
+        """Note that OpenAI rejected a request for rate limiting"""
+        self.throttled_at = time.monotonic()
 
 class OpenAIService:
-    """OpenAI service with rate limiting and error handling"""
+    """OpenAI service with retrying client and error handling"""
     
     def __init__(self):
         """Initialize OpenAI service with validation"""
         self._validate_environment()
         self.client = self._initialize_client()
         self.rate_limiter = RateLimiter()
-        self._health_check()
+        self._last_health_check = 0.0  # time.time() of the last successful API probe
+        # Connectivity is probed once in the background at startup (or first use), never at import
+        self._healthy: Optional[bool] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._models_cache: Tuple[float, Optional[List[Dict[str, Any]]]] = (0.0, None)
         logger.info("OpenAI service initialized successfully")
     
     def _validate_environment(self):
@@ -55,48 +99,102 @@ class OpenAIService:
         if not settings.OPENAI_API_KEY.startswith('sk-'):
             logger.warning("OpenAI API key format appears invalid (should start with 'sk-')")
     
-    def _initialize_client(self) -> openai.OpenAI:
+    def _initialize_client(self) -> openai.AsyncOpenAI:
         """Initialize and validate OpenAI client"""
         try:
-            client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+            # Async client so completions overlap on the event loop instead of blocking it,
+            # over a tuned HTTP/2 pool so concurrent requests share warm connections
+            # (pool limits belong on the transport; the client ignores them once one is given)
+            http_client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True,
+                    retries=2,
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                    )
+                ),
+                timeout=httpx.Timeout(
+                    connect=HTTP_CONNECT_TIMEOUT,
+                    read=HTTP_READ_TIMEOUT,
+                    write=HTTP_WRITE_TIMEOUT,
+                    pool=HTTP_POOL_TIMEOUT
+                )
+            )
+            client = openai.AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                max_retries=OPENAI_MAX_RETRIES,
+                http_client=http_client
+            )
             logger.info("OpenAI client created successfully")
             return client
         except Exception as e:
             logger.error(f"Failed to create OpenAI client: {e}")
             raise RuntimeError(f"OpenAI client initialization failed: {e}")
     
-    def _health_check(self):
-        """Verify OpenAI API connection is working"""
+    async def _health_check(self):
+        """Verify OpenAI API connection is working and record the result"""
         try:
             # Simple health check - try to access API
             # Just verify the client can make a basic request
-            self.client.models.list()
+            await self.client.models.list()
+            self._last_health_check = time.time()
+            self._healthy = True
             logger.info("OpenAI API health check passed")
         except Exception as e:
+            self._healthy = False
             logger.error(f"OpenAI API health check failed: {e}")
-            raise RuntimeError(f"OpenAI service unavailable: {e}")
     
-    def _check_rate_limit(self):
-        """Check if request is rate limited"""
-        if self.rate_limiter.is_rate_limited():
-            raise RuntimeError("Rate limit exceeded. Please try again later.")
+    def start_health_probe(self):
+        """Run the startup connectivity check in the background, once"""
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_check())
+    
+    def _raise_for_rate_limit(self, error: Exception):
+        """Translate a 429 that outlasted the SDK's retries into the service's rate limit error"""
+        if isinstance(error, openai.RateLimitError):
+            self.rate_limiter.record_throttled()
+            raise RuntimeError("Rate limit exceeded. Please try again later.") from error
     
     def create_openai_client(self):
         """
         Create and return an OpenAI client with configured settings.
         
         Returns:
-            openai.OpenAI: Configured OpenAI client instance
+            openai.AsyncOpenAI: Configured OpenAI client instance
         """
-        # Check rate limit before creating client
-        self._check_rate_limit()
-        
         if not settings.OPENAI_API_KEY:
             raise ValueError("OpenAI API key is not configured. Please set OPENAI_API_KEY environment variable or create a .env file with your API key.")
         
         return self.client
     
-    def chat_completion(
+    @staticmethod
+    def _resolve_params(mode: str, model: str, max_tokens: int, temperature: float):
+        """Apply the mode's configured defaults to unset parameters and validate them"""
+        if mode not in VALID_MODES:
+            raise ValueError(f"Invalid mode '{mode}'. Mode must be 'lazy' or 'pro'")
+        
+        default_model, default_max_tokens, default_temperature = _mode_defaults(mode)
+        if model is None:
+            model = default_model
+        if max_tokens is None:
+            max_tokens = default_max_tokens
+        if temperature is None:
+            temperature = default_temperature
+        
+        if not isinstance(model, str) or not model:
+            raise ValueError("Model must be a non-empty string")
+        
+        if not (MIN_TEMPERATURE <= temperature <= MAX_TEMPERATURE):
+            raise ValueError(f"Temperature must be between {MIN_TEMPERATURE} and {MAX_TEMPERATURE}")
+        
+        if max_tokens < MIN_MAX_TOKENS or max_tokens > MAX_MAX_TOKENS:
+            raise ValueError(f"Max tokens must be between {MIN_MAX_TOKENS} and {MAX_MAX_TOKENS}")
+        
+        return model, max_tokens, temperature
+    
+    async def chat_completion(
         self, 
         messages: List[Dict[str, str]], 
         model: str = None,  # Allow override, otherwise use config
@@ -104,40 +202,21 @@ class OpenAIService:
         temperature: float = None,  # Allow override, otherwise use config
         mode: str = "lazy"  # "lazy" or "pro"
     ) -> Dict[str, Any]:
-        """Create chat completion with rate limiting and error handling"""
+        """Create chat completion with retries and error handling"""
+        self.start_health_probe()
         try:
-            # Check rate limit
-            self._check_rate_limit()
-            
-            # Validate mode parameter
-            if mode not in ["lazy", "pro"]:
-                raise ValueError(f"Invalid mode '{mode}'. Mode must be 'lazy' or 'pro'")
-            
-            # Use config values if not provided
-            if model is None:
-                model = settings.LAZY_MODEL if mode == "lazy" else settings.PRO_MODEL
-            
-            if max_tokens is None:
-                max_tokens = settings.LAZY_MAX_TOKENS if mode == "lazy" else settings.PRO_MAX_TOKENS
+            # Counted for observability only; OpenAI enforces the actual limit
+            self.rate_limiter.record()
             
-            if temperature is None:
-                temperature = settings.LAZY_TEMPERATURE if mode == "lazy" else settings.PRO_TEMPERATURE
+            # Fill in mode defaults and validate the generation parameters
+            model, max_tokens, temperature = self._resolve_params(mode, model, max_tokens, temperature)
             
             # Validate inputs
             if not messages or not isinstance(messages, list):
                 raise ValueError("Messages must be a non-empty list")
             
-            if not isinstance(model, str) or not model:
-                raise ValueError("Model must be a non-empty string")
-            
-            if not (0 <= temperature <= 2):
-                raise ValueError("Temperature must be between 0 and 2")
-            
-            if max_tokens < 1 or max_tokens > 4000:
-                raise ValueError("Max tokens must be between 1 and 4000")
-            
             # Perform chat completion
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=model,
                 messages=messages,
                 max_tokens=max_tokens,
@@ -163,9 +242,10 @@ class OpenAIService:
             raise
         except Exception as e:
             logger.error(f"Chat completion failed: {e}")
+            self._raise_for_rate_limit(e)
             raise RuntimeError(f"Chat completion failed: {e}")
     
-    def text_completion(
+    async def text_completion(
         self, 
         prompt: str, 
         model: str = None,  # Allow override, otherwise use config
@@ -174,42 +254,23 @@ class OpenAIService:
         mode: str = "lazy"  # "lazy" or "pro"
     ) -> Dict[str, Any]:
         """Create text completion using chat completion API (compatible with modern models)"""
+        self.start_health_probe()
         try:
-            # Check rate limit
-            self._check_rate_limit()
-            
-            # Validate mode parameter
-            if mode not in ["lazy", "pro"]:
-                raise ValueError(f"Invalid mode '{mode}'. Mode must be 'lazy' or 'pro'")
+            # Counted for observability only; OpenAI enforces the actual limit
+            self.rate_limiter.record()
             
-            # Use config values if not provided
-            if model is None:
-                model = settings.LAZY_MODEL if mode == "lazy" else settings.PRO_MODEL
-            
-            if max_tokens is None:
-                max_tokens = settings.LAZY_MAX_TOKENS if mode == "lazy" else settings.PRO_MAX_TOKENS
-            
-            if temperature is None:
-                temperature = settings.LAZY_TEMPERATURE if mode == "lazy" else settings.PRO_TEMPERATURE
+            # Fill in mode defaults and validate the generation parameters
+            model, max_tokens, temperature = self._resolve_params(mode, model, max_tokens, temperature)
             
             # Validate inputs
             if not prompt or not isinstance(prompt, str):
                 raise ValueError("Prompt must be a non-empty string")
             
-            if not isinstance(model, str) or not model:
-                raise ValueError("Model must be a non-empty string")
-            
-            if not (0 <= temperature <= 2):
-                raise ValueError("Temperature must be between 0 and 2")
-            
-            if max_tokens < 1 or max_tokens > 4000:
-                raise ValueError("Max tokens must be between 1 and 4000")
-            
             # Convert prompt to chat format for compatibility with modern models
             messages = [{"role": "user", "content": prompt}]
             
             # Use chat completion instead of text completion
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=model,
                 messages=messages,
                 max_tokens=max_tokens,
@@ -235,15 +296,19 @@ class OpenAIService:
             raise
         except Exception as e:
             logger.error(f"Text completion failed: {e}")
+            self._raise_for_rate_limit(e)
             raise RuntimeError(f"Text completion failed: {e}")
     
-    def list_models(self) -> List[Dict[str, Any]]:
-        """List available OpenAI models"""
+    async def list_models(self) -> List[Dict[str, Any]]:
+        """List available OpenAI models, cached for MODELS_CACHE_TTL seconds"""
+        cached_at, cached_models = self._models_cache
+        if cached_models is not None and time.monotonic() - cached_at < MODELS_CACHE_TTL:
+            # Copy so callers can't mutate the cached list
+            return list(cached_models)
+        
         try:
-            # Check rate limit
-            self._check_rate_limit()
-            
-            response = self.client.models.list()
+            self.rate_limiter.record()
+            response = await self.client.models.list()
             
             models = []
             for model in response.data:
@@ -256,27 +321,35 @@ class OpenAIService:
                 })
             
             logger.info(f"Retrieved {len(models)} models successfully")
-            return models
+            self._models_cache = (time.monotonic(), models)
+            return list(models)
             
         except Exception as e:
             logger.error(f"Failed to list models: {e}")
+            if isinstance(e, openai.RateLimitError):
+                self.rate_limiter.record_throttled()
             # Return empty list instead of crashing
             return []
     
-    def health_check(self) -> Dict[str, Any]:
+    async def health_check(self) -> Dict[str, Any]:
         """Check OpenAI service health"""
         try:
-            # Check API connectivity
-            self.client.models.list()
+            # Check API connectivity, reusing a recent successful probe so frequent
+            # health polling doesn't spend OpenAI requests
+            now = time.time()
+            if now - self._last_health_check >= HEALTH_CACHE_TTL:
+                await self.client.models.list()
+                self._last_health_check = now
             
-            # Check rate limiting status
-            is_rate_limited = self.rate_limiter.is_rate_limited()
+            # Report whether OpenAI has throttled us recently (probes aren't counted)
+            is_rate_limited = self.rate_limiter.is_limited()
             
             return {
                 "status": "healthy",
                 "service": "openai",
                 "timestamp": time.time(),
                 "api_connected": True,
+                "startup_probe_passed": self._healthy,  # None until the startup probe finishes
                 "rate_limited": is_rate_limited,
                 "requests_in_window": len(self.rate_limiter.requests)
             }
@@ -286,37 +359,51 @@ class OpenAIService:
                 "status": "unhealthy",
                 "service": "openai",
                 "timestamp": time.time(),
+                "startup_probe_passed": self._healthy,
                 "error": str(e)
             }
     
     def get_usage_info(self) -> Dict[str, Any]:
         """Get current usage information"""
+        rate_limited = self.rate_limiter.is_limited()
         return {
             "requests_in_window": len(self.rate_limiter.requests),
-            "rate_limited": self.rate_limiter.is_rate_limited(),
+            "rate_limited": rate_limited,
             "max_requests_per_minute": MAX_REQUESTS_PER_MINUTE
         }
 
-# Create singleton instance with proper error handling
-try:
-    openai_service = OpenAIService()
-    logger.info("OpenAI service singleton created successfully")
-except Exception as e:
-    logger.critical(f"Failed to initialize OpenAI service: {e}")
-    openai_service = None
+@lru_cache(maxsize=1)
+def get_openai_service() -> Optional[OpenAIService]:
+    """Return the shared OpenAIService, creating it on first use (None if it can't be configured)"""
+    try:
+        service = OpenAIService()
+        logger.info("OpenAI service singleton created successfully")
+        return service
+    except Exception as e:
+        logger.critical(f"Failed to initialize OpenAI service: {e}")
+        return None
 
 # Keep the original function for backward compatibility
 def create_openai_client():
     """
-    Create and return an OpenAI client with configured settings.
+    Return the service's shared OpenAI client.
+    
+    The client (and its connection pool) is created once with the service and
+    reused; fetching it doesn't count against the request rate limit.
     
     Returns:
-        openai.OpenAI: Configured OpenAI client instance
+        openai.AsyncOpenAI: Configured OpenAI client instance
     """
+    openai_service = get_openai_service()
     if openai_service is None:
         raise RuntimeError("OpenAI service is not available")
     
-    return openai_service.create_openai_client()
+    return openai_service.client
 
-# Export openai_client for backward compatibility with inference files
-openai_client = create_openai_client()
+def __getattr__(name: str):
+    # Keep `from services.openai_service import openai_service/openai_client` working, lazily
+    if name == "openai_service":
+        return get_openai_service()
+    if name == "openai_client":
+        return create_openai_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,12 +2,15 @@ import redis
 import json
 import hashlib
 import time
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+OPTIMIZATION_CACHE_TTL = 3600  # Seconds a cached prompt optimization lives (1 hour)
+
 class RedisService:
     def __init__(self):
         """Initialize Redis connection with configuration from settings."""
@@ -34,7 +37,7 @@ class RedisService:
         return f"prompt_optimization:{hashlib.md5(content.encode()).hexdigest()}"
 
     def cache_optimized_prompt(self, prompt: str, optimized_prompt: str, inference_type: str, 
-                              model_used: str, tokens_used: int, ttl: int = 3600) -> bool:
+                              model_used: str, tokens_used: int, ttl: int = OPTIMIZATION_CACHE_TTL) -> bool:
         """
         Cache an optimized prompt result.
         
@@ -270,5 +273,13 @@ class RedisService:
             logger.error(f"Error getting cache stats: {e}")
             return {"error": str(e)}
 
-# Create a global Redis service instance
-redis_service = RedisService()
+@lru_cache(maxsize=1)
+def get_redis_service() -> RedisService:
+    """Return the shared RedisService, connecting on first use rather than at import."""
+    return RedisService()
+
+def __getattr__(name: str):
+    # Keep `from services.redis import redis_service` working, lazily
+    if name == "redis_service":
+        return get_redis_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
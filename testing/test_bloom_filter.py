@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Unit tests for utils.helpers.BloomFilter
+
+Runs without any external services:
+    python -m pytest testing/test_bloom_filter.py
+    python testing/test_bloom_filter.py
+"""
+
+import math
+import os
+import sys
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.helpers import BloomFilter
+
+def test_no_false_negatives():
+    """Every added item is reported as present"""
+    bloom = BloomFilter(10_000, 1e-3)
+    emails = [f"user{i}@example.com" for i in range(10_000)]
+    for email in emails:
+        bloom.add(email)
+
+    assert all(email in bloom for email in emails)
+    assert len(bloom) == len(emails)
+
+def test_empty_filter_contains_nothing():
+    """A fresh filter has no members"""
+    bloom = BloomFilter(100, 0.01)
+    assert "anyone@example.com" not in bloom
+    assert len(bloom) == 0
+
+def test_sizing_matches_capacity_and_error_rate():
+    """Bits and hash count follow the standard optimal formulas"""
+    capacity, error_rate = 100_000, 1e-4
+    bloom = BloomFilter(capacity, error_rate)
+
+    expected_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    assert bloom.num_bits == expected_bits
+    assert bloom.num_hashes == round(expected_bits / capacity * math.log(2))
+    assert len(bloom._bits) == (expected_bits + 7) // 8
+
+def test_tiny_filter_keeps_minimums():
+    """Degenerate sizes still give a usable filter"""
+    bloom = BloomFilter(1, 0.5)
+    assert bloom.num_bits >= 8
+    assert bloom.num_hashes >= 1
+    bloom.add("only@example.com")
+    assert "only@example.com" in bloom
+
+def test_false_positive_rate_within_bound():
+    """At capacity, the observed false positive rate stays near error_rate"""
+    capacity, error_rate = 5_000, 0.01
+    bloom = BloomFilter(capacity, error_rate)
+    for i in range(capacity):
+        bloom.add(f"member{i}@example.com")
+
+    probes = 20_000
+    false_positives = sum(f"outsider{i}@example.com" in bloom for i in range(probes))
+    assert false_positives / probes < error_rate * 2
+
+def main():
+    """Run all tests and report"""
+    tests = [
+        test_no_false_negatives,
+        test_empty_filter_contains_nothing,
+        test_sizing_matches_capacity_and_error_rate,
+        test_tiny_filter_keeps_minimums,
+        test_false_positive_rate_within_bound,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} BloomFilter tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
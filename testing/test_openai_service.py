@@ -12,6 +12,7 @@ This script tests all functionality of the OpenAI service including:
 - Mode selection and model switching
 """
 
+import asyncio
 import os
 import sys
 import time
@@ -20,7 +21,7 @@ from typing import Dict, Any
 # Add the project root to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-def test_openai_service():
+async def test_openai_service():
     """Test the OpenAI service functionality"""
     
     print("🚀 Testing OpenAI Service...")
@@ -39,7 +40,7 @@ def test_openai_service():
         
         # Test 2: Health check
         print("\n2️⃣ Testing health check...")
-        health = openai_service.health_check()
+        health = await openai_service.health_check()
         print(f"Health status: {health['status']}")
         print(f"API connected: {health['api_connected']}")
         
@@ -52,7 +53,7 @@ def test_openai_service():
         # Test 3: List models (optional)
         print("\n3️⃣ Testing model listing (optional)...")
         try:
-            models = openai_service.list_models()
+            models = await openai_service.list_models()
             print(f"Found {len(models)} models")
             if models:
                 print(f"First model: {models[0]['id']}")
@@ -77,7 +78,7 @@ def test_openai_service():
                 {"role": "user", "content": "Hello! How are you today?"}
             ]
             
-            response = openai_service.chat_completion(
+            response = await openai_service.chat_completion(
                 messages=messages,
                 mode="lazy"
             )
@@ -99,7 +100,7 @@ def test_openai_service():
                 {"role": "user", "content": "Explain quantum computing in simple terms"}
             ]
             
-            response = openai_service.chat_completion(
+            response = await openai_service.chat_completion(
                 messages=messages,
                 mode="pro"
             )
@@ -119,7 +120,7 @@ def test_openai_service():
         try:
             prompt = "The future of artificial intelligence is"
             
-            response = openai_service.text_completion(
+            response = await openai_service.text_completion(
                 prompt=prompt,
                 mode="lazy"
             )
@@ -139,7 +140,7 @@ def test_openai_service():
         try:
             prompt = "The future of artificial intelligence is"
             
-            response = openai_service.text_completion(
+            response = await openai_service.text_completion(
                 prompt=prompt,
                 mode="pro"
             )
@@ -161,7 +162,7 @@ def test_openai_service():
                 {"role": "user", "content": "Write a short poem about coding"}
             ]
             
-            response = openai_service.chat_completion(
+            response = await openai_service.chat_completion(
                 messages=messages,
                 model="gpt-3.5-turbo",  # Override model
                 max_tokens=100,         # Override max tokens
@@ -187,7 +188,7 @@ def test_openai_service():
             
             for i in range(3):
                 try:
-                    response = openai_service.chat_completion(
+                    response = await openai_service.chat_completion(
                         messages=[{"role": "user", "content": f"Test message {i+1}"}],
                         mode="lazy"
                     )
@@ -222,7 +223,7 @@ def test_openai_service():
         
         # Test empty messages
         try:
-            openai_service.chat_completion(messages=[], mode="lazy")
+            await openai_service.chat_completion(messages=[], mode="lazy")
             print("❌ Should have failed with empty messages")
             return False
         except ValueError as e:
@@ -230,7 +231,7 @@ def test_openai_service():
         
         # Test invalid temperature
         try:
-            openai_service.chat_completion(
+            await openai_service.chat_completion(
                 messages=[{"role": "user", "content": "test"}],
                 temperature=3.0,  # Invalid temperature
                 mode="lazy"
@@ -242,7 +243,7 @@ def test_openai_service():
         
         # Test invalid max_tokens
         try:
-            openai_service.chat_completion(
+            await openai_service.chat_completion(
                 messages=[{"role": "user", "content": "test"}],
                 max_tokens=0,  # Invalid max_tokens
                 mode="lazy"
@@ -259,7 +260,7 @@ def test_openai_service():
         
         # Test invalid mode
         try:
-            openai_service.chat_completion(
+            await openai_service.chat_completion(
                 messages=[{"role": "user", "content": "test"}],
                 mode="invalid_mode"
             )
@@ -324,7 +325,7 @@ def main():
         return
     
     # Test the service
-    if test_openai_service():
+    if asyncio.run(test_openai_service()):
         print("\n🎯 All tests passed! OpenAI service is ready for production.")
     else:
         print("\n💥 Some tests failed. Please check the errors above.")
@@ -1,4 +1,8 @@
+import hashlib
 import logging
+import math
+import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Union
 from fastapi import HTTPException
 import json
@@ -260,3 +264,122 @@ def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
         
     except Exception:
         return str(text)[:max_length] if text else ""
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Bounded in-process cache with per-entry expiry.
+    
+    Entries expire ttl seconds after they are set. When the cache holds
+    maxsize entries, setting a new key evicts the least recently used one.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+    
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+        
+        Returns:
+            Cached value or default
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Cache a value, evicting the least recently used entry if full.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Seconds this entry lives, overriding the cache default
+        """
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def pop(self, key: Any, default: Any = None) -> Any:
+        """
+        Remove a key and return its value if it had not expired.
+        
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+        
+        Returns:
+            Removed value or default
+        """
+        entry = self._data.pop(key, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return default
+        return entry[1]
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+    
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter for fast negative membership checks.
+    
+    A miss means the item was never added; a hit may be a false positive
+    at roughly error_rate while no more than capacity items are added.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+    
+    def _positions(self, item: str):
+        # Double hashing: derive every probe from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+    
+    def add(self, item: str) -> None:
+        """
+        Add an item to the filter.
+        
+        Args:
+            item: Item to add
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+    
+    def __len__(self) -> int:
+        return self._count